@@ -1,28 +1,113 @@
 """
 Qt helper to append products into index.html and keep JSON-LD in sync.
 Requires PyQt5 (pip install pyqt5). Run: python product_manager.py
+Image conversion needs Pillow; on AVX2 CPUs prefer the drop-in pillow-simd
+(pip uninstall pillow && pip install pillow-simd) for much faster resize/encode.
+Optional: httpx[http2] for add_products_async (pip install 'httpx[http2]'),
+orjson for faster JSON-LD rewrites (pip install orjson).
 """
 
+import asyncio
+import hashlib
 import json
+import mmap
+import os
 import re
+import shutil
 import sys
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from io import BytesIO
 from pathlib import Path
-from typing import Optional, Tuple
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from PyQt5 import QtCore, QtWidgets
 try:
     from PIL import Image, UnidentifiedImageError
+    from PIL import __version__ as PIL_VERSION
 except ImportError:  # Pillow might not be installed
     Image = None
+    PIL_VERSION = None
     UnidentifiedImageError = Exception
+try:
+    import httpx
+except ImportError:  # httpx is only needed for add_products_async
+    httpx = None
+try:
+    import h2  # noqa: F401  # httpx[http2] extra; without it httpx can only speak HTTP/1.1
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+try:
+    import orjson
+except ImportError:  # fall back to stdlib json for the JSON-LD block
+    orjson = None
 
 
 INDEX_PATH = Path("index.html")
+NOT_FOUND_PATH = Path("404.html")
 IMAGES_DIR = Path("images")
+# sha1(image URL) -> {"url", "dest"} of the webp it produced, so re-runs skip download and encode
+IMAGE_CACHE_PATH = IMAGES_DIR / ".cache.json"
 MAX_WIDTH = 350
+# Bilinear is ~2-3x faster than Lanczos (see the Pillow-SIMD resize benchmarks) and
+# indistinguishable at thumbnail size; Lanczos is kept for heavy downscales that alias.
+RESIZE_FILTER = Image.BILINEAR if Image else None
+LANCZOS_DOWNSCALE_RATIO = 4
+WEBP_QUALITY = 85
+# libwebp effort 0-6; 6 costs 3-5x the CPU of 4 for <2% smaller thumbnails
+WEBP_METHOD = 4
+DOWNLOAD_WORKERS = 10
+# On spawn platforms (Windows/macOS) every worker re-imports this module, PyQt5 and
+# requests included, so small batches are cheaper to encode serially
+ENCODE_POOL_MIN_JOBS = 4
+# (connect, read) seconds: a stalled handshake fails fast without cutting short a slow body
+REQUEST_TIMEOUT = (5, 15)
+PREVIEW_DEBOUNCE_MS = 150
+
+# First try without AVIF to avoid formats Pillow may not decode
+ACCEPT_PRIMARY = "image/webp,image/jpeg,image/png,image/*;q=0.8,*/*;q=0.5"
+ACCEPT_FALLBACK = "image/jpeg,image/png,*/*;q=0.5"
+
+_BASE_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Referer": "https://xpresszone.github.io/products/",
+}
+# Read-only, prebuilt per Accept value so downloads don't rebuild them per request
+_IMAGE_HEADERS = {
+    accept: MappingProxyType({**_BASE_HEADERS, "Accept": accept})
+    for accept in (ACCEPT_PRIMARY, ACCEPT_FALLBACK)
+}
+
+_SLUG_RE = re.compile(r"[^a-zA-Z0-9]+")
+_URL_RE = re.compile(r"^https?://", re.IGNORECASE)
+_JS_ESCAPES = str.maketrans({"\\": "\\\\", "'": "\\'", "\n": " "})
+
+# (start, end, replacement) byte range edit against index.html
+Edit = Tuple[int, int, bytes]
+
+# Shared session so repeated image downloads reuse keep-alive connections;
+# transient CDN failures are retried here with backoff rather than by callers.
+# Up to 3 retries (4 attempts). The final error response is handed back so
+# raise_for_status() still reports it, and Retry-After is ignored so a long
+# 429 delay can't freeze the Qt window; the capped backoff applies instead.
+SESSION = requests.Session()
+_retry = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=["GET"],
+    raise_on_status=False,
+    respect_retry_after_header=False,
+)
+_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=_retry)
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
 
 
 def load_file(path: Path) -> str:
@@ -30,24 +115,31 @@ def load_file(path: Path) -> str:
 
 
 def save_file(path: Path, content: str) -> None:
-    path.write_text(content, encoding="utf-8")
+    save_bytes(path, content.encode("utf-8"))
 
 
-def update_products_js(content: str, product: dict) -> str:
-    """Insert a new product object before the in-file marker comment."""
-    marker = "// Add more products here over time"
-    if marker not in content:
-        raise ValueError("Marker comment for product insertion not found.")
+def save_bytes(path: Path, data: bytes) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    if path.exists():
+        shutil.copymode(path, tmp)
+    os.replace(tmp, path)
+
+
+def mirror_file(src: Path, dest: Path) -> None:
+    """Make dest a hardlink to src, falling back to a byte copy where links are unsupported."""
+    dest.unlink(missing_ok=True)
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copyfile(src, dest)
 
+
+def render_product_block(product: dict) -> str:
     def esc(value: str) -> str:
-        return (
-            value.replace("\\", "\\\\")
-            .replace("'", "\\'")
-            .replace("\n", " ")
-            .strip()
-        )
+        return value.translate(_JS_ESCAPES).strip()
 
-    product_block = (
+    return (
         "    {\n"
         f"      title: '{esc(product['title'])}',\n"
         f"      url: '{esc(product['url'])}',\n"
@@ -57,68 +149,233 @@ def update_products_js(content: str, product: dict) -> str:
         "    },\n"
     )
 
-    updated = content.replace(marker, product_block + "    " + marker, 1)
-    updated = re.sub(r"}\s*(// Add more products here over time)", "},\n    \\1", updated, count=1)
-    return updated
 
+def find_products_marker(buf) -> int:
+    idx = buf.find(b"// Add more products here over time")
+    if idx == -1:
+        raise ValueError("Marker comment for product insertion not found.")
+    return idx
+
+
+def detect_newline(buf, offset: int) -> str:
+    """Return the line ending used just before offset, so CRLF pages don't get LF mixed in."""
+    nl = buf.rfind(b"\n", 0, offset)
+    return "\r\n" if nl > 0 and buf[nl - 1:nl] == b"\r" else "\n"
 
-def update_json_ld(content: str, product: dict) -> str:
-    """Append product to JSON-LD ItemList and update numberOfItems."""
-    match = re.search(
-        r'<script type="application/ld\+json">\s*(\{[\s\S]*?\})\s*</script>',
-        content,
-    )
-    if not match:
-        raise ValueError("JSON-LD block not found.")
 
-    schema_str = match.group(1)
-    data = json.loads(schema_str)
+def products_js_edits(buf, idx: int, products: List[dict], newline: str) -> List[Edit]:
+    """Edits inserting product objects before the marker comment at idx."""
+    # Each block is followed by the marker's indent, matching one-at-a-time insertion
+    blocks = "".join(render_product_block(p) + "    " for p in products)
+    blocks = blocks.replace("\n", newline)
+    edits = [(idx, idx, blocks.encode("utf-8"))]
 
-    item = {
-        "@type": "ListItem",
-        "position": len(data.get("itemListElement", [])) + 1,
-        "url": product["url"],
-        "name": product["title"],
-        "image": product["image"],
-    }
-    data.setdefault("itemListElement", []).append(item)
-    data["numberOfItems"] = len(data["itemListElement"])
+    # If only whitespace separates the last entry from the marker, it still needs its comma
+    close = buf.rfind(b"}", 0, idx)
+    if close != -1 and not buf[close + 1:idx].strip():
+        edits.append((close + 1, close + 1, b","))
+    return edits
 
-    new_schema = json.dumps(data, indent=2)
-    return content.replace(schema_str, new_schema, 1)
+
+def loads_json_ld(text: str):
+    return orjson.loads(text) if orjson else json.loads(text)
+
+
+def dumps_json_ld(data) -> str:
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def find_json_ld(buf) -> Tuple[int, int]:
+    """Return the (start, end) byte offsets of the JSON-LD object inside its script tag."""
+    tag = b'<script type="application/ld+json">'
+    start = buf.find(tag)
+    end = buf.find(b"</script>", start) if start != -1 else -1
+    brace = buf.find(b"{", start, end) if end != -1 else -1
+    if brace == -1:
+        raise ValueError("JSON-LD block not found.")
+    return brace, brace + len(buf[brace:end].rstrip())
+
+
+def json_ld_edit(buf, products: List[dict], newline: str) -> Edit:
+    """Edit appending products to the JSON-LD ItemList and updating numberOfItems."""
+    start, end = find_json_ld(buf)
+    data = loads_json_ld(buf[start:end].decode("utf-8"))
+    items = data.setdefault("itemListElement", [])
+    for product in products:
+        items.append({
+            "@type": "ListItem",
+            "position": len(items) + 1,
+            "url": product["url"],
+            "name": product["title"],
+            "image": product["image"],
+        })
+    data["numberOfItems"] = len(items)
+    # JSON strings never contain raw newlines, so this only touches the indentation
+    new_schema = dumps_json_ld(data).replace("\n", newline)
+    return start, end, new_schema.encode("utf-8")
+
+
+def apply_edits(buf, edits: Iterable[Edit]) -> bytes:
+    """Splice non-overlapping (start, end, replacement) edits into buf."""
+    parts = []
+    pos = 0
+    for start, end, replacement in sorted(edits, key=lambda e: e[0]):
+        parts.append(buf[pos:start])
+        parts.append(replacement)
+        pos = end
+    parts.append(buf[pos:])
+    return b"".join(parts)
+
+
+def rewrite_index(make_edits) -> None:
+    """Apply make_edits(buf) to index.html without decoding the whole page, then mirror 404.html."""
+    with INDEX_PATH.open("rb") as fh:
+        # mmap refuses empty files; an empty buffer still yields the usual "not found" errors
+        size = os.fstat(fh.fileno()).st_size
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) if size else nullcontext(b"") as buf:
+            data = apply_edits(buf, make_edits(buf))
+    save_bytes(INDEX_PATH, data)
+    mirror_file(INDEX_PATH, NOT_FOUND_PATH)
+
+
+def _product_edits(buf, products: List[dict]) -> List[Edit]:
+    idx = find_products_marker(buf)
+    newline = detect_newline(buf, idx)
+    return products_js_edits(buf, idx, products, newline) + [json_ld_edit(buf, products, newline)]
+
+
+def _write_products(products: List[dict]) -> None:
+    if not products:
+        return
+    # Serialize the JSON-LD once per batch rather than once per product
+    rewrite_index(lambda buf: _product_edits(buf, products))
+    for product in products:
+        print(f"Added product: {product['title']}")
+
+
+def _encode_all(jobs: List[Tuple[bytes, str, str, str]], cache: Dict[str, dict]) -> None:
+    """Run encode_webp over (data, content_type, image_url, title) jobs, in parallel for larger batches."""
+    if not jobs:
+        return
+    # Evict every target up front: if a job fails, files other jobs already overwrote
+    # must not stay reachable through older entries
+    for _, _, _, title in jobs:
+        forget_cached_dest(cache, image_dest(title))
+    # Record in the parent, as each result lands, so the image cache file has a single writer
+    try:
+        if len(jobs) >= ENCODE_POOL_MIN_JOBS:
+            workers = min(len(jobs), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for (_, _, image_url, _), dest in zip(jobs, pool.map(encode_webp, *zip(*jobs))):
+                    remember_cached_image(cache, image_url, dest)
+        else:
+            for job in jobs:
+                remember_cached_image(cache, job[2], encode_webp(*job))
+    finally:
+        save_image_cache(cache)
+
+
+def _check_image_slugs(products: List[dict]) -> None:
+    """Reject batches where different image URLs would be written to the same images/<slug>.webp."""
+    urls_by_dest: Dict[str, set] = {}
+    for p in products:
+        urls_by_dest.setdefault(image_dest(p["title"]), set()).add(p["image"])
+    for dest, urls in urls_by_dest.items():
+        if len(urls) > 1:
+            raise ValueError(f"Titles in this batch share the image file {dest} but use different images.")
+
+
+def _lookup_cached_images(
+    cache: Dict[str, dict],
+    products: List[dict],
+) -> Dict[Tuple[str, str], Optional[str]]:
+    return {(p["image"], p["title"]): lookup_cached_image(cache, p["image"], p["title"]) for p in products}
+
+
+def _missing_urls(hits: Dict[Tuple[str, str], Optional[str]]) -> List[str]:
+    return list(dict.fromkeys(url for (url, _), dest in hits.items() if dest is None))
+
+
+def _apply_images(
+    products: List[dict],
+    cache: Dict[str, dict],
+    hits: Dict[Tuple[str, str], Optional[str]],
+    downloads: Dict[str, Tuple[bytes, str]],
+) -> List[dict]:
+    # One job per dest: products sharing a slug (and so, per _check_image_slugs, a URL)
+    # must not write the same file from two processes
+    jobs: Dict[str, Tuple[bytes, str, str, str]] = {}
+    for p in products:
+        if hits[p["image"], p["title"]] is None:
+            jobs.setdefault(image_dest(p["title"]), (*downloads[p["image"]], p["image"], p["title"]))
+    _encode_all(list(jobs.values()), cache)
+
+    cached = []
+    for product in products:
+        product = product.copy()
+        product["image"] = hits[product["image"], product["title"]] or image_dest(product["title"])
+        cached.append(product)
+    return cached
+
+
+def add_products(products: List[dict]) -> None:
+    """Download images on a thread pool, encode them on a process pool, then update the HTML serially."""
+    _require_pillow()
+    _check_image_slugs(products)
+    cache = load_image_cache()
+    hits = _lookup_cached_images(cache, products)
+    urls = _missing_urls(hits)
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as pool:
+        downloads = dict(zip(urls, pool.map(download_image, urls)))
+    _write_products(_apply_images(products, cache, hits, downloads))
 
 
 def add_product(product: dict) -> None:
-    product = product.copy()
-    product["image"] = cache_image_as_webp(product["image"], product["title"])
+    add_products([product])
+
+
+def add_products_async(products: List[dict]) -> None:
+    """Like add_products, but downloads every image over one HTTP/2 client.
+
+    Connection failures are retried, but unlike SESSION there is no backoff retry
+    on 429/5xx responses; those fail the batch on the first error.
+    """
+    if httpx is None:
+        raise RuntimeError("httpx is required for async downloads. Install with: pip install 'httpx[http2]'")
+    _require_pillow()
+    _check_image_slugs(products)
 
-    content = load_file(INDEX_PATH)
-    content = update_products_js(content, product)
-    content = update_json_ld(content, product)
-    save_file(INDEX_PATH, content)
-    save_file(Path("404.html"), content)
-    print(f"Added product: {product['title']}")
+    cache = load_image_cache()
+    hits = _lookup_cached_images(cache, products)
+    downloads = asyncio.run(_fetch_all(_missing_urls(hits)))
+    _write_products(_apply_images(products, cache, hits, downloads))
 
 
 def slugify(text: str) -> str:
-    text = re.sub(r"[^a-zA-Z0-9]+", "-", text.lower()).strip("-")
+    text = _SLUG_RE.sub("-", text.lower()).strip("-")
     return text or "image"
 
 
+def image_headers(accept_header: str) -> Mapping[str, str]:
+    headers = _IMAGE_HEADERS.get(accept_header)
+    if headers is None:
+        headers = {**_BASE_HEADERS, "Accept": accept_header}
+    return headers
+
+
 def fetch_image_bytes(image_url: str, accept_header: str) -> Tuple[bytes, str]:
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Referer": "https://xpresszone.github.io/products/",
-        "Accept": accept_header,
-    }
     try:
-        resp = requests.get(image_url, headers=headers, timeout=15)
+        resp = SESSION.get(image_url, headers=image_headers(accept_header), timeout=REQUEST_TIMEOUT)
         resp.raise_for_status()
         return resp.content, resp.headers.get("Content-Type", "")
     except requests.HTTPError as exc:
-        status = exc.response.status_code if exc.response else "no-status"
-        reason = exc.response.reason if exc.response else ""
-        body_snippet = exc.response.text[:300] if exc.response and exc.response.text else ""
+        # Response is falsy for 4xx/5xx, so compare against None explicitly
+        response = exc.response
+        status = response.status_code if response is not None else "no-status"
+        reason = response.reason if response is not None else ""
+        body_snippet = response.text[:300] if response is not None and response.text else ""
         print(f"[image-download] HTTP {status} for {image_url}: {reason}")
         if body_snippet:
             print(f"[image-download] body: {body_snippet}")
@@ -128,30 +385,163 @@ def fetch_image_bytes(image_url: str, accept_header: str) -> Tuple[bytes, str]:
         raise
 
 
-def cache_image_as_webp(image_url: str, title: str) -> str:
+async def fetch_image_bytes_async(client, image_url: str, accept_header: str) -> Tuple[bytes, str]:
+    try:
+        resp = await client.get(image_url, headers=image_headers(accept_header))
+        resp.raise_for_status()
+        return resp.content, resp.headers.get("Content-Type", "")
+    except httpx.HTTPStatusError as exc:
+        print(f"[image-download] HTTP {exc.response.status_code} for {image_url}: {exc.response.reason_phrase}")
+        body_snippet = exc.response.text[:300]
+        if body_snippet:
+            print(f"[image-download] body: {body_snippet}")
+        raise
+    except httpx.HTTPError as exc:
+        print(f"[image-download] Request error for {image_url}: {exc}")
+        raise
+
+
+async def _fetch_image_async(client, image_url: str) -> Tuple[bytes, str]:
+    data, content_type = await fetch_image_bytes_async(client, image_url, ACCEPT_PRIMARY)
+    if is_avif(data, content_type):
+        print(f"[image-download] Received AVIF, retrying with jpeg/png preference for {image_url}")
+        data, content_type = await fetch_image_bytes_async(client, image_url, ACCEPT_FALLBACK)
+    return data, content_type
+
+
+async def _fetch_all(urls: List[str]) -> Dict[str, Tuple[bytes, str]]:
+    """Download all URLs concurrently over a shared client (HTTP/2 when h2 is installed)."""
+    unique = list(dict.fromkeys(urls))
+    # httpx only retries failed connects at the transport level, not error statuses
+    transport = httpx.AsyncHTTPTransport(
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_connections=16),
+        retries=3,
+    )
+    async with httpx.AsyncClient(
+        transport=transport,
+        timeout=httpx.Timeout(REQUEST_TIMEOUT[1], connect=REQUEST_TIMEOUT[0]),
+        follow_redirects=True,  # requests follows them by default; keep both paths alike
+    ) as client:
+        results = await asyncio.gather(*[_fetch_image_async(client, url) for url in unique])
+    return dict(zip(unique, results))
+
+
+def is_avif(data: bytes, content_type: str) -> bool:
+    # ISOBMFF: box size (4 bytes), then "ftyp" and the major brand
+    if data[4:8] == b"ftyp" and data[8:12] in (b"avif", b"avis"):
+        return True
+    return content_type.startswith("image/avif")
+
+
+def image_dest(title: str) -> str:
+    return f"{IMAGES_DIR.as_posix()}/{slugify(title)}.webp"
+
+
+def load_image_cache() -> Dict[str, dict]:
+    """Read the image cache; it is disposable, so a missing or corrupt file counts as empty."""
+    if not IMAGE_CACHE_PATH.exists():
+        return {}
+    try:
+        cache = json.loads(load_file(IMAGE_CACHE_PATH))
+    except ValueError:
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def save_image_cache(cache: Dict[str, dict]) -> None:
+    save_file(IMAGE_CACHE_PATH, json.dumps(cache, indent=2))
+
+
+def lookup_cached_image(cache: Dict[str, dict], image_url: str, title: str) -> Optional[str]:
+    """Return the webp previously produced for image_url under this title, if still on disk."""
+    key = hashlib.sha1(image_url.encode("utf-8")).hexdigest()
+    entry = cache.get(key)
+    dest = image_dest(title)
+    if (
+        isinstance(entry, dict)
+        and entry.get("url") == image_url
+        and entry.get("dest") == dest
+        and Path(dest).exists()
+    ):
+        return dest
+    return None
+
+
+def forget_cached_dest(cache: Dict[str, dict], dest: str) -> None:
+    """Drop every entry pointing at dest, which is about to be (or was just) overwritten."""
+    for k in [k for k, v in cache.items() if not isinstance(v, dict) or v.get("dest") == dest]:
+        del cache[k]
+
+
+def remember_cached_image(cache: Dict[str, dict], image_url: str, dest: str) -> None:
+    """Record dest for image_url in the in-memory cache; save_image_cache persists it."""
+    key = hashlib.sha1(image_url.encode("utf-8")).hexdigest()
+    # dest was just overwritten, so entries for other URLs sharing the slug are stale
+    forget_cached_dest(cache, dest)
+    cache[key] = {"url": image_url, "dest": dest}
+
+
+def webp_width(data: bytes) -> Optional[int]:
+    """Read the width of a complete, still, metadata-free WEBP, or None for anything else."""
+    if len(data) < 30 or data[:4] != b"RIFF" or data[8:12] != b"WEBP":
+        return None
+    # A RIFF size that disagrees with what we downloaded means a truncated or padded file
+    if int.from_bytes(data[4:8], "little") + 8 != len(data):
+        return None
+    chunk = data[12:16]
+    if chunk == b"VP8 " and data[23:26] == b"\x9d\x01\x2a":
+        return int.from_bytes(data[26:28], "little") & 0x3FFF
+    if chunk == b"VP8L" and data[20] == 0x2F:
+        return (int.from_bytes(data[21:25], "little") & 0x3FFF) + 1
+    # Animated (0x02), XMP (0x04) and EXIF (0x08) files go through Pillow, which drops the metadata
+    if chunk == b"VP8X" and not data[20] & 0x0E:
+        return int.from_bytes(data[24:27], "little") + 1
+    return None
+
+
+def _require_pillow() -> None:
     if Image is None:
         raise RuntimeError("Pillow is required to convert images to webp. Install with: pip install Pillow")
 
-    IMAGES_DIR.mkdir(exist_ok=True)
-    slug = slugify(title)
-    dest = IMAGES_DIR / f"{slug}.webp"
 
-    # First try without AVIF to avoid formats Pillow may not decode
-    accept_primary = "image/webp,image/jpeg,image/png,image/*;q=0.8,*/*;q=0.5"
-    data, content_type = fetch_image_bytes(image_url, accept_primary)
+def download_image(image_url: str) -> Tuple[bytes, str]:
+    data, content_type = fetch_image_bytes(image_url, ACCEPT_PRIMARY)
 
     # If server still returns AVIF, try a secondary request with stricter accept
-    if "avif" in content_type.lower() or b"ftypavif" in data[:32]:
+    if is_avif(data, content_type):
         print(f"[image-download] Received AVIF, retrying with jpeg/png preference for {image_url}")
-        data, content_type = fetch_image_bytes(image_url, "image/jpeg,image/png,*/*;q=0.5")
+        data, content_type = fetch_image_bytes(image_url, ACCEPT_FALLBACK)
+    return data, content_type
+
+
+def encode_webp(data: bytes, content_type: str, image_url: str, title: str) -> str:
+    """Convert downloaded image bytes to a resized webp under IMAGES_DIR.
+
+    Module-level and side-effect free apart from the output file, so it can run in a worker process.
+    """
+    _require_pillow()
+
+    IMAGES_DIR.mkdir(exist_ok=True)
+    dest = image_dest(title)
+
+    # Already a small webp: store it as-is instead of decoding and re-encoding
+    width = webp_width(data)
+    if width is not None and width <= MAX_WIDTH:
+        Path(dest).write_bytes(data)
+        return dest
 
     try:
         with Image.open(BytesIO(data)) as img:
+            if img.format == "JPEG":
+                # Let libjpeg decode at a reduced scale; the resize below finishes the job
+                img.draft("RGB", (MAX_WIDTH * 2, MAX_WIDTH * 2))
             img = img.convert("RGB")
             if img.width > MAX_WIDTH:
                 new_height = max(1, int((MAX_WIDTH / float(img.width)) * img.height))
-                img = img.resize((MAX_WIDTH, new_height), Image.LANCZOS)
-            img.save(dest, "WEBP", quality=85, method=6)
+                heavy = img.width > MAX_WIDTH * LANCZOS_DOWNSCALE_RATIO
+                img = img.resize((MAX_WIDTH, new_height), Image.LANCZOS if heavy else RESIZE_FILTER)
+            img.save(dest, "WEBP", quality=WEBP_QUALITY, method=WEBP_METHOD, lossless=False, exact=False)
     except UnidentifiedImageError:
         head = data[:80]
         print(f"[image-download] Unidentified image for {image_url}")
@@ -159,7 +549,7 @@ def cache_image_as_webp(image_url: str, title: str) -> str:
         print(f"[image-download] Bytes head (len={len(data)}): {head}")
         raise
 
-    return str(dest).replace("\\", "/")
+    return dest
 
 
 class ProductForm(QtWidgets.QDialog):
@@ -179,6 +569,11 @@ class ProductForm(QtWidgets.QDialog):
             '  "description": ""\n'
             '}\n'
         )
+        # Re-parse only once typing pauses instead of on every keystroke
+        self._preview_timer = QtCore.QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(PREVIEW_DEBOUNCE_MS)
+        self._preview_timer.timeout.connect(self._do_update_preview)
         self.json_input.textChanged.connect(self.update_preview)
         layout.addRow("Product JSON *", self.json_input)
 
@@ -212,7 +607,7 @@ class ProductForm(QtWidgets.QDialog):
 
         for key in ["url", "image"]:
             value = product.get(key, "")
-            if value and not re.match(r"^https?://", value, re.IGNORECASE):
+            if value and not _URL_RE.match(value):
                 errors.append(f"{key} must start with http:// or https://")
 
         return errors
@@ -246,6 +641,9 @@ class ProductForm(QtWidgets.QDialog):
             self.preview_status.setText("")
 
     def update_preview(self):
+        self._preview_timer.start()
+
+    def _do_update_preview(self):
         text = self.json_input.toPlainText().strip()
         if not text:
             self.set_preview_display(None, "Awaiting JSON...", ok=False)
@@ -299,6 +697,10 @@ def main():
         print("index.html not found next to this script.")
         sys.exit(1)
 
+    if PIL_VERSION:
+        # pillow-simd releases carry a ".postN" suffix, e.g. 9.0.0.post1
+        print(f"[pillow] Using Pillow {PIL_VERSION}")
+
     app = QtWidgets.QApplication(sys.argv)
     form = ProductForm()
     form.show()